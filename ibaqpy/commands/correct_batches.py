@@ -4,20 +4,20 @@ from pathlib import Path
 from typing import Union
 
 import click
+import numpy as np
 import pandas as pd
 
 from ibaqpy.ibaq.file_utils import create_anndata, combine_ibaq_tsv_files
 from ibaqpy.ibaq.ibaqpy_commons import SAMPLE_ID_REGEX, SAMPLE_ID, PROTEIN_NAME, IBAQ, IBAQ_BEC
-from ibaqpy.ibaq.ibaqpy_postprocessing import (
-    pivot_wider,
-    pivot_longer,
-)
+from ibaqpy.ibaq.ibaqpy_postprocessing import pivot_wider
 from ibaqpy.ibaq.utils import apply_batch_correction
 
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
+_BATCH_ID_REGEX = re.compile(r"^[A-Za-z0-9]+$")
+
 
 def is_valid_sample_id(
     samples: Union[str, list, pd.Series], sample_id_pattern: str = SAMPLE_ID_REGEX
@@ -42,16 +42,14 @@ def is_valid_sample_id(
     bool
         True if all sample IDs are valid, False otherwise.
     """
-    sample_pattern = re.compile(sample_id_pattern)
-
-    # Ensure samples is a list for uniform processing
+    # Ensure samples is a Series for uniform processing
     if isinstance(samples, str):
         samples = [samples]
-    elif isinstance(samples, pd.Series):
-        samples = samples.tolist()
+    samples = pd.Series(samples, dtype=object)
 
     # Identify invalid sample names.
-    invalid_samples = [sample for sample in samples if not sample_pattern.fullmatch(sample)]
+    valid = samples.str.fullmatch(sample_id_pattern, na=False)
+    invalid_samples = samples[~valid].tolist()
 
     if invalid_samples:
         logger.error("The following sample IDs are invalid:")
@@ -85,18 +83,19 @@ def get_batch_id_from_sample_names(samples: list) -> list:
         If a sample name does not contain a valid batch ID prefix or if the
         batch ID contains non-alphanumeric characters.
     """
-    batch_ids = []
-    for sample in samples:
-        parts = sample.split("-")
-        if not parts or not parts[0]:
-            raise ValueError(f"Invalid sample name format: {sample}. Expected batch-id prefix.")
-        batch_id = parts[0]
-        if not re.match(r"^[A-Za-z0-9]+$", batch_id):
-            raise ValueError(
-                f"Invalid batch ID format: {batch_id}. Expected alphanumeric characters only."
-            )
-        batch_ids.append(batch_id)
-    return pd.factorize(batch_ids)[0]
+    samples = pd.Series(samples, dtype=object)
+    batch_ids = samples.str.split("-", n=1).str[0]
+    missing = batch_ids.isna() | (batch_ids == "")
+    if missing.any():
+        sample = samples[missing].iloc[0]
+        raise ValueError(f"Invalid sample name format: {sample}. Expected batch-id prefix.")
+    invalid = ~batch_ids.str.match(_BATCH_ID_REGEX, na=False)
+    if invalid.any():
+        batch_id = batch_ids[invalid].iloc[0]
+        raise ValueError(
+            f"Invalid batch ID format: {batch_id}. Expected alphanumeric characters only."
+        )
+    return pd.factorize(batch_ids.to_numpy())[0]
 
 
 def run_batch_correction(
@@ -181,20 +180,42 @@ def run_batch_correction(
     logger.info("Applying batch correction to iBAQ values")
     df_corrected = apply_batch_correction(df_wide, list(batch_ids), kwargs={})
 
-    # Convert the data back to long format
-    df_corrected = df_corrected.reset_index()
-    df_corrected_long = pivot_longer(
-        df_corrected,
-        row_name=protein_id_column,
-        col_name=sample_id_column,
-        values=ibaq_corrected_column,
+    # Convert the data back to long format. The merge keys are categoricals whose categories
+    # start with the matrix labels, followed by the keys the pivot dropped (e.g. proteins
+    # without any iBAQ value), so the long frame is built from positional codes.
+    proteins, samples = df_corrected.index, df_corrected.columns
+    keys = {}
+    for column, labels in ((sample_id_column, samples), (protein_id_column, proteins)):
+        dropped = pd.Index(df_ibaq[column].dropna().unique()).difference(labels)
+        keys[column] = labels.append(dropped)
+    corrected = df_corrected.to_numpy()
+    df_corrected_long = pd.DataFrame(
+        {
+            protein_id_column: pd.Categorical.from_codes(
+                np.tile(np.arange(len(proteins)), len(samples)),
+                categories=keys[protein_id_column],
+            ),
+            sample_id_column: pd.Categorical.from_codes(
+                np.repeat(np.arange(len(samples)), len(proteins)),
+                categories=keys[sample_id_column],
+            ),
+            ibaq_corrected_column: corrected.ravel(order="F"),
+        }
     )
+    if df_corrected_long[ibaq_corrected_column].isna().any():
+        logger.warning(
+            f"Found {df_corrected_long[ibaq_corrected_column].isna().sum()} missing values "
+            "in the corrected iBAQ values"
+        )
 
     # Add the corrected ibaq values to the original dataframe.
-    # Use sample/protein ID keys to merge the dataframes.
-    df_ibaq = df_ibaq.merge(
-        df_corrected_long, how="left", on=[sample_id_column, protein_id_column]
-    )
+    # Use sample/protein ID keys to merge the dataframes. Both sides share the same
+    # categories, so the join runs on their integer codes.
+    key_dtypes = df_ibaq[list(keys)].dtypes.to_dict()
+    for column, categories in keys.items():
+        df_ibaq[column] = pd.Categorical(df_ibaq[column], categories=categories)
+    df_ibaq = df_ibaq.merge(df_corrected_long, how="left", on=list(keys))
+    df_ibaq = df_ibaq.astype(key_dtypes)
 
     # Save the corrected iBAQ values to a file
     if output:
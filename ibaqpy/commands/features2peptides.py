@@ -70,6 +70,13 @@ from ibaqpy.model.normalization import FeatureNormalizationMethod, PeptideNormal
     help="Save normalized peptides to parquet",
     is_flag=True,
 )
+@click.option(
+    "--n_jobs",
+    help="Number of processes used to normalize samples in parallel (-1 uses all cores). "
+    "Per-sample log messages from worker processes are not shown when above 1",
+    default=1,
+    type=int,
+)
 @click.pass_context
 def features2parquet(
     ctx,
@@ -86,6 +93,7 @@ def features2parquet(
     pnmethod: str,
     log2: bool,
     save_parquet: bool,
+    n_jobs: int,
 ) -> None:
     """
     Convert feature data to a parquet file with optional normalization and filtering steps.
@@ -105,4 +113,5 @@ def features2parquet(
         pnmethod=pnmethod,
         log2=log2,
         save_parquet=save_parquet,
+        n_jobs=n_jobs,
     )
@@ -1,5 +1,6 @@
 import logging
 import os
+from collections import Counter
 from pathlib import Path
 
 import numpy as np
@@ -64,15 +65,11 @@ class Combiner:
             raise FileNotFoundError(f"Data folder {self.data_folder} does not exsit!")
         self.covariate = covariate
         files = folder_retrieval(str(self.data_folder))
-        self.metadata, self.df = pd.DataFrame(), pd.DataFrame()
-        for sdrf in files["sdrf"]:
-            sdrf_df = load_sdrf(sdrf)
-            self.metadata = pd.concat([self.metadata, generate_meta(sdrf_df)])
+        self.metadata = pd.concat([generate_meta(load_sdrf(sdrf)) for sdrf in files["sdrf"]])
         self.metadata = self.metadata.drop_duplicates()
         self.metadata.index = self.metadata["sample_id"]
 
-        for ibaq in files["ibaq"]:
-            self.df = pd.concat([self.df, load_feature(ibaq)])
+        self.df = pd.concat([load_feature(ibaq) for ibaq in files["ibaq"]])
         self.df = self.df[self.df["ProteinName"].str.endswith(organism)]
         self.df.index = self.df["SampleID"]
         self.df = self.df.join(self.metadata, how="left")
@@ -199,8 +196,8 @@ class Combiner:
         logger.info("Removing outliers from imputed data ...")
         # Apply iterative outlier removal on imputed data
         # get batch indices from the columns names
-        batches = [sample.split("-")[0] for sample in self.samples]
-        self.samples_number = {dataset: batches.count(dataset) for dataset in self.datasets}
+        batches = Counter(sample.split("-")[0] for sample in self.samples)
+        self.samples_number = {dataset: batches[dataset] for dataset in self.datasets}
         min_samples = round(np.median(list(self.samples_number.values())))
         if min_samples == 1:
             min_samples = 2
@@ -2,11 +2,15 @@ import os
 import re
 import logging
 
-from typing import Iterator, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional
 
 import pandas as pd
 import numpy as np
 import duckdb
+from joblib import Parallel, delayed
+import pyarrow as pa
+import pyarrow.compute as pc
 
 from ibaqpy.model.quantification_type import QuantificationCategory, IsobaricLabel
 from ibaqpy.model.normalization import FeatureNormalizationMethod, PeptideNormalizationMethod
@@ -35,6 +39,16 @@ logger = logging.getLogger("ibaqpy.peptide_normalization")
 logger.addHandler(logging.NullHandler())
 
 
+# Modifications enclosed in parentheses or brackets, e.g. M(Oxidation) or [Acetyl]
+_MOD_RE = re.compile(r"[\(\[].*?[\)\]]")
+
+# Column names of older feature tables and their current equivalents
+_LEGACY_COLUMNS = {"protein_accessions": "pg_accessions", "charge": "precursor_charge"}
+
+# An accession of the form db|ACCESSION|name, delimited by ';' or the ends of the string
+_UNIPROT_RE = re.compile(r"(?<![^;])[^|;]*\|([^|;]*)\|[^|;]*(?![^;])")
+
+
 def parse_uniprot_accession(uniprot_id: str) -> str:
     """
     Parse a UniProt accession string to extract and return the core accession numbers.
@@ -59,6 +73,19 @@ def parse_uniprot_accession(uniprot_id: str) -> str:
     return ";".join(result_uniprot_list)
 
 
+def parse_uniprot_accessions(uniprot_ids: pd.Series) -> pd.Series:
+    """
+    Vectorized version of `parse_uniprot_accession` for a Series of protein groups.
+
+    Parameters:
+        uniprot_ids (pd.Series): Strings containing one or more UniProt accessions.
+
+    Returns:
+        pd.Series: Semicolon-separated strings of core accession numbers.
+    """
+    return uniprot_ids.str.replace(_UNIPROT_RE, r"\1", regex=True)
+
+
 def get_canonical_peptide(peptide_sequence: str) -> str:
     """
     Remove modifications and special characters from a peptide sequence.
@@ -73,7 +100,7 @@ def get_canonical_peptide(peptide_sequence: str) -> str:
     Returns:
         str: The cleaned canonical peptide sequence.
     """
-    clean_peptide = re.sub(r"[\(\[].*?[\)\]]", "", peptide_sequence)
+    clean_peptide = _MOD_RE.sub("", peptide_sequence)
     clean_peptide = clean_peptide.replace(".", "").replace("-", "")
     return clean_peptide
 
@@ -99,17 +126,40 @@ def analyse_sdrf(
     # Determine label type
     label, channel_set = QuantificationCategory.classify(labels)
     if label in (QuantificationCategory.TMT, QuantificationCategory.ITRAQ):
-        choice_df = (
-            pd.DataFrame.from_dict(channel_set.channels(), orient="index", columns=[CHANNEL])
-            .reset_index()
-            .rename(columns={"index": "comment[label]"})
-        )
-        sdrf_df = sdrf_df.merge(choice_df, on="comment[label]", how="left")
+        sdrf_df[CHANNEL] = sdrf_df["comment[label]"].map(channel_set.channels())
     sample_names = sdrf_df["source name"].unique().tolist()
     technical_repetitions = len(sdrf_df["comment[technical replicate]"].unique())
     return technical_repetitions, label, sample_names, channel_set
 
 
+def get_technical_replicates(runs: Iterable[str]) -> dict[str, int]:
+    """
+    Maps run identifiers to technical replicate numbers.
+
+    Each run is parsed on its own: runs of the form 'biorep_techrep_fraction' are mapped
+    to their second part, otherwise the run identifier itself is the technical replicate
+    number, so both forms may be mixed.
+
+    Parameters:
+        runs (Iterable[str]): The distinct run identifiers.
+
+    Returns:
+        dict[str, int]: A mapping from each run identifier to its technical replicate.
+
+    Raises:
+        ValueError: If a run identifier cannot be parsed into a technical replicate.
+    """
+    tec_reps = {}
+    for run in runs:
+        # Check for '_' before calling int(), which would read '1_2_1' as 121
+        parts = str(run).split("_")
+        try:
+            tec_reps[run] = int(parts[1] if len(parts) > 1 else parts[0])
+        except ValueError as e:
+            raise ValueError(f"Cannot parse a technical replicate from run '{run}'") from e
+    return tec_reps
+
+
 def remove_contaminants_entrapments_decoys(
     dataset: pd.DataFrame, protein_field=PROTEIN_NAME
 ) -> pd.DataFrame:
@@ -126,9 +176,14 @@ def remove_contaminants_entrapments_decoys(
     Returns:
         pd.DataFrame: A DataFrame with the contaminants, entrapments, and decoys removed.
     """
-    contaminants = ["CONTAMINANT", "ENTRAP", "DECOY"]
-    cregex = "|".join(contaminants)
-    return dataset[~dataset[protein_field].str.contains(cregex)]
+    contaminants = ("CONTAMINANT", "ENTRAP", "DECOY")
+    # Markers may appear anywhere in a protein group; each distinct group is checked once.
+    removed = [
+        protein
+        for protein in pd.unique(dataset[protein_field])
+        if any(contaminant in protein for contaminant in contaminants)
+    ]
+    return dataset[~dataset[protein_field].isin(removed)]
 
 
 def remove_protein_by_ids(
@@ -149,11 +204,14 @@ def remove_protein_by_ids(
     Returns:
         pd.DataFrame: A DataFrame with the specified proteins removed.
     """
-    contaminants_reader = open(protein_file, "r")
-    contaminants = contaminants_reader.read().split("\n")
-    contaminants = [cont for cont in contaminants if cont.strip()]
-    cregex = "|".join(contaminants)
-    return dataset[~dataset[protein_field].str.contains(cregex, regex=True)]
+    with open(protein_file, "r") as contaminants_reader:
+        contaminants = {line.strip() for line in contaminants_reader if line.strip()}
+    if not contaminants:
+        return dataset
+    # The IDs are matched as literal substrings, once per distinct protein group.
+    cregex = re.compile("|".join(map(re.escape, sorted(contaminants))))
+    removed = [protein for protein in pd.unique(dataset[protein_field]) if cregex.search(protein)]
+    return dataset[~dataset[protein_field].isin(removed)]
 
 
 def reformat_quantms_feature_table_quant_labels(
@@ -175,7 +233,6 @@ def reformat_quantms_feature_table_quant_labels(
         pd.DataFrame: The reformatted DataFrame with updated column names and channel information.
     """
     data_df = data_df.rename(columns=parquet_map)
-    data_df[PROTEIN_NAME] = data_df[PROTEIN_NAME].str.join(";")
     if label == QuantificationCategory.LFQ:
         data_df.drop(CHANNEL, inplace=True, axis=1)
     else:
@@ -210,36 +267,36 @@ def apply_initial_filtering(data_df: pd.DataFrame, min_aa: int) -> pd.DataFrame:
     data_df = data_df[(data_df["Condition"] != "Empty") | (data_df["Condition"].isnull())]
 
     # Filter peptides with less amino acids than min_aa (default: 7)
-    data_df.loc[:, "len"] = data_df[PEPTIDE_CANONICAL].apply(len)
-    data_df = data_df[data_df["len"] >= min_aa]
-    data_df.drop(["len"], inplace=True, axis=1)
-    data_df[PROTEIN_NAME] = data_df[PROTEIN_NAME].apply(parse_uniprot_accession)
+    data_df = data_df[data_df[PEPTIDE_CANONICAL].str.len() >= min_aa]
+    # Protein groups repeat across many features, so parse each distinct one only once.
+    proteins = pd.Series(pd.unique(data_df[PROTEIN_NAME].values), dtype=object)
+    accessions = dict(zip(proteins, parse_uniprot_accessions(proteins)))
+    data_df[PROTEIN_NAME] = data_df[PROTEIN_NAME].map(accessions)
     if FRACTION not in data_df.columns:
-        data_df[FRACTION] = 1
-
-    # TODO: What if there's a mix of identifiers?
-    if data_df[RUN].str.contains("_").all():
-        data_df[TECHREPLICATE] = data_df[RUN].str.split("_").str.get(1)
-        data_df[TECHREPLICATE] = data_df[TECHREPLICATE].astype("int")
-    else:
-        data_df[TECHREPLICATE] = data_df[RUN].astype("int")
-
-    data_df = data_df[
-        [
-            PROTEIN_NAME,
-            PEPTIDE_SEQUENCE,
-            PEPTIDE_CANONICAL,
-            PEPTIDE_CHARGE,
-            INTENSITY,
-            CONDITION,
-            TECHREPLICATE,
-            BIOREPLICATE,
-            FRACTION,
-            SAMPLE_ID,
-        ]
+        data_df[FRACTION] = np.int8(1)
+
+    # Runs repeat for every feature, so parse each distinct run identifier only once.
+    tec_reps = get_technical_replicates(pd.unique(data_df[RUN].values))
+    data_df[TECHREPLICATE] = data_df[RUN].map(tec_reps).astype("int")
+
+    keep = [
+        PROTEIN_NAME,
+        PEPTIDE_SEQUENCE,
+        PEPTIDE_CANONICAL,
+        PEPTIDE_CHARGE,
+        INTENSITY,
+        CONDITION,
+        TECHREPLICATE,
+        BIOREPLICATE,
+        FRACTION,
+        SAMPLE_ID,
     ]
-    data_df[CONDITION] = pd.Categorical(data_df[CONDITION])
-    data_df[SAMPLE_ID] = pd.Categorical(data_df[SAMPLE_ID])
+    extra = data_df.columns.difference(keep)
+    if len(extra):
+        data_df = data_df.drop(columns=extra)
+    # Categorical group keys are hashed as small integer codes
+    for column in [PROTEIN_NAME, PEPTIDE_SEQUENCE, PEPTIDE_CANONICAL, CONDITION, SAMPLE_ID]:
+        data_df[column] = pd.Categorical(data_df[column])
 
     return data_df
 
@@ -295,20 +352,19 @@ def get_peptidoform_normalize_intensities(
                       only the highest intensity entries per group.
     """
     dataset.dropna(subset=[NORM_INTENSITY], inplace=True)
+    keys = [PEPTIDE_SEQUENCE, PEPTIDE_CHARGE, SAMPLE_ID, CONDITION, BIOREPLICATE]
     if higher_intensity:
-        dataset = dataset.loc[
-            dataset.groupby(
-                [PEPTIDE_SEQUENCE, PEPTIDE_CHARGE, SAMPLE_ID, CONDITION, BIOREPLICATE],
-                observed=True,
-            )[NORM_INTENSITY].idxmax()
-        ]
+        # Rows with a missing key belong to no group, so they are dropped
+        dataset = dataset.dropna(subset=keys)
+        # Visit rows from the highest intensity down (stable, so ties resolve to the first row)
+        # and keep the first row of each group, restoring the original row order.
+        order = np.argsort(-dataset[NORM_INTENSITY].to_numpy(), kind="stable")
+        first = ~dataset[keys].iloc[order].duplicated().to_numpy()
+        dataset = dataset.iloc[np.sort(order[first])]
     # else:
-    #     dataset = dataset.loc[
-    #         dataset.groupby(
-    #             [PEPTIDE_SEQUENCE, PEPTIDE_CHARGE, SAMPLE_ID, CONDITION, BIOREPLICATE],
-    #             observed=True,
-    #         )[SEARCH_ENGINE].idxmax()
-    #     ]
+    #     order = np.argsort(-dataset[SEARCH_ENGINE].to_numpy(), kind="stable")
+    #     first = ~dataset[keys].iloc[order].duplicated().to_numpy()
+    #     dataset = dataset.iloc[np.sort(order[first])]
     dataset.reset_index(drop=True, inplace=True)
     return dataset
 
@@ -332,25 +388,53 @@ def sum_peptidoform_intensities(dataset: pd.DataFrame) -> pd.DataFrame:
         unique peptidoform entry.
     """
     dataset.dropna(subset=[NORM_INTENSITY], inplace=True)
-    dataset = dataset[
-        [
-            PROTEIN_NAME,
-            PEPTIDE_CANONICAL,
-            SAMPLE_ID,
-            BIOREPLICATE,
-            CONDITION,
-            NORM_INTENSITY,
-        ]
-    ]
-    dataset.loc[:, NORM_INTENSITY] = dataset.groupby(
-        [PROTEIN_NAME, PEPTIDE_CANONICAL, SAMPLE_ID, BIOREPLICATE, CONDITION],
-        observed=True,
-    )[NORM_INTENSITY].transform("sum")
-    dataset = dataset.drop_duplicates()
-    dataset.reset_index(inplace=True, drop=True)
+    dataset = (
+        dataset.groupby(
+            [PROTEIN_NAME, PEPTIDE_CANONICAL, SAMPLE_ID, BIOREPLICATE, CONDITION],
+            observed=True,
+            sort=False,
+        )[NORM_INTENSITY]
+        .sum()
+        .reset_index()
+    )
     return dataset
 
 
+def fetch_arrow_reader(
+    result: duckdb.DuckDBPyConnection, batch_size: int = 1_000_000
+) -> pa.RecordBatchReader:
+    """
+    Streams the result of an executed DuckDB query as Arrow record batches.
+
+    Parameters:
+        result (duckdb.DuckDBPyConnection): The connection or cursor the query was executed on.
+        batch_size (int): The number of rows per record batch. Defaults to 1,000,000.
+
+    Returns:
+        pa.RecordBatchReader: A reader over the query result.
+    """
+    # duckdb 1.5 deprecates fetch_record_batch in favour of to_arrow_reader
+    if hasattr(result, "to_arrow_reader"):
+        return result.to_arrow_reader(batch_size)
+    return result.fetch_record_batch(batch_size)
+
+
+def fetch_arrow_table(result: duckdb.DuckDBPyConnection) -> pa.Table:
+    """
+    Fetches the result of an executed DuckDB query as an Arrow table.
+
+    Parameters:
+        result (duckdb.DuckDBPyConnection): The connection or cursor the query was executed on.
+
+    Returns:
+        pa.Table: The query result.
+    """
+    # duckdb 1.5 deprecates fetch_arrow_table in favour of to_arrow_table
+    if hasattr(result, "to_arrow_table"):
+        return result.to_arrow_table()
+    return result.fetch_arrow_table()
+
+
 class Feature:
     """
     Represents a feature in a proteomics dataset, providing methods for data manipulation
@@ -365,11 +449,13 @@ class Feature:
     Methods:
         __init__(database_path: str): Initializes the Feature object and connects to the database.
         standardize_df(df: pd.DataFrame) -> pd.DataFrame: Standardizes column names in a DataFrame.
+        join_protein_groups(table) -> pa.Table: Joins list-typed protein groups into strings.
+        encode_table(table, categorical) -> pa.Table: Prepares a fetched table for pandas.
         experimental_inference() -> tuple: Infers experimental details from the dataset.
         low_frequency_peptides(percentage=0.2) -> tuple: Identifies low-frequency peptides.
         csv2parquet(csv): Converts a CSV file to a Parquet file.
-        get_report_from_database(samples: list, columns: list = None) -> pd.DataFrame: Retrieves a report from the database.
-        iter_samples(sample_num: int = 20, columns: list = None) -> Iterator: Iterates over samples in batches.
+        get_report_from_database(samples, ...) -> pd.DataFrame: Retrieves a sample report.
+        iter_samples(sample_num: int = 20, ...) -> Iterator: Iterates over samples in batches.
         get_unique_samples() -> list[str]: Retrieves unique sample accessions.
         get_unique_labels() -> list[str]: Retrieves unique channel labels.
         get_unique_tec_reps() -> list[int]: Retrieves unique technical repetition identifiers.
@@ -388,9 +474,37 @@ class Feature:
     def __init__(self, database_path: str):
         if os.path.exists(database_path):
             self.parquet_db = duckdb.connect()
+            scan = "parquet_scan('{}')".format(database_path)
+            # Expose older column names under their current names, so column projections and
+            # filters in the queries work for both feature table layouts.
+            described = self.parquet_db.execute(f"DESCRIBE SELECT * FROM {scan}").fetchall()
+            names = [row[0] for row in described]
+            select = ", ".join(
+                (
+                    f'"{name}" AS "{_LEGACY_COLUMNS[name]}"'
+                    if name in _LEGACY_COLUMNS and _LEGACY_COLUMNS[name] not in names
+                    else f'"{name}"'
+                )
+                for name in names
+            )
             self.parquet_db = self.parquet_db.execute(
-                "CREATE VIEW parquet_db AS SELECT * FROM parquet_scan('{}')".format(database_path)
+                f"CREATE VIEW parquet_db AS SELECT {select} FROM {scan}"
             )
+            # Collect the distinct values needed for experimental inference in one scan
+            (
+                self._unique_samples,
+                self._unique_labels,
+                self._unique_runs,
+                self._unique_conditions,
+            ) = self.parquet_db.sql(
+                """
+                SELECT coalesce(list(DISTINCT sample_accession ORDER BY sample_accession), []),
+                       coalesce(list(DISTINCT channel ORDER BY channel), []),
+                       coalesce(list(DISTINCT run ORDER BY run), []),
+                       coalesce(list(DISTINCT condition ORDER BY condition), [])
+                FROM parquet_db
+                """
+            ).fetchone()
             self.samples = self.get_unique_samples()
         else:
             raise FileNotFoundError(f"the file {database_path} does not exist.")
@@ -406,9 +520,43 @@ class Feature:
         Returns:
             pd.DataFrame: A DataFrame with standardized column names.
         """
-        return df.rename(
-            {"protein_accessions": "pg_accessions", "charge": "precursor_charge"}, axis=1
-        )
+        return df.rename(_LEGACY_COLUMNS, axis=1)
+
+    @staticmethod
+    def join_protein_groups(table: pa.Table) -> pa.Table:
+        """
+        Joins the list-typed protein accession column of an Arrow table into ';'-separated strings.
+
+        Parameters:
+            table (pa.Table): The Arrow table fetched from the Parquet database.
+
+        Returns:
+            pa.Table: The table with protein groups as strings, ready for pandas conversion.
+        """
+        for name in ("pg_accessions", "protein_accessions"):
+            if name in table.column_names and pa.types.is_list(table.schema.field(name).type):
+                index = table.column_names.index(name)
+                table = table.set_column(index, name, pc.binary_join(table[name], ";"))
+        return table
+
+    @staticmethod
+    def encode_table(table: pa.Table, categorical: list[str]) -> pa.Table:
+        """
+        Prepares an Arrow table fetched from the Parquet database for pandas conversion.
+
+        Parameters:
+            table (pa.Table): The Arrow table fetched from the Parquet database.
+            categorical (list[str]): The columns to dictionary-encode, which pandas converts
+                                     to categoricals.
+
+        Returns:
+            pa.Table: The table with protein groups joined and the given columns encoded.
+        """
+        table = Feature.join_protein_groups(table)
+        for name in categorical:
+            index = table.column_names.index(name)
+            table = table.set_column(index, name, pc.dictionary_encode(table[name]))
+        return table
 
     @property
     def experimental_inference(
@@ -442,26 +590,22 @@ class Feature:
             tuple: A tuple of tuples, each containing a protein group accession and a peptide sequence
                    that are identified as low frequency.
         """
-        f_table = self.parquet_db.sql(
+        # Threshold and accession parsing run in DuckDB so only low frequency rows are fetched
+        f_table = self.parquet_db.execute(
             """
-            SELECT "sequence", "pg_accessions", COUNT(DISTINCT sample_accession) as "count" from parquet_db
-            GROUP BY "sequence","pg_accessions"
-            """
-        ).df()
-        f_table.dropna(subset=["pg_accessions"], inplace=True)
-        try:
-            f_table["pg_accessions"] = f_table["pg_accessions"].apply(lambda x: x[0].split("|")[1])
-        except IndexError:
-            f_table["pg_accessions"] = f_table["pg_accessions"].apply(lambda x: x[0])
-        except Exception as e:
-            raise ValueError("Some errors occurred when parsing pg_accessions column in feature parquet!") from e
-        f_table.set_index(["sequence", "pg_accessions"], inplace=True)
-        f_table.drop(
-            f_table[f_table["count"] >= (percentage * len(self.samples))].index,
-            inplace=True,
-        )
-        f_table.reset_index(inplace=True)
-        return tuple(zip(f_table["pg_accessions"], f_table["sequence"]))
+            SELECT "sequence",
+                   CASE WHEN contains("pg_accessions"[1], '|')
+                        THEN split_part("pg_accessions"[1], '|', 2)
+                        ELSE "pg_accessions"[1]
+                   END AS "pg_accessions"
+            FROM parquet_db
+            GROUP BY "sequence", "pg_accessions"
+            HAVING "pg_accessions"[1] IS NOT NULL
+               AND COUNT(DISTINCT sample_accession) < ?
+            """,
+            [percentage * len(self.samples)],
+        ).fetchall()
+        return tuple((protein, sequence) for sequence, protein in f_table)
 
     @staticmethod
     def csv2parquet(csv):
@@ -477,7 +621,15 @@ class Feature:
         parquet_path = os.path.splitext(csv)[0] + ".parquet"
         duckdb.read_csv(csv).to_parquet(parquet_path)
 
-    def get_report_from_database(self, samples: list, columns: list = None):
+    def get_report_from_database(
+        self,
+        samples: list,
+        columns: list = None,
+        min_aa: Optional[int] = None,
+        rows_per_batch: int = 1_000_000,
+        categorical: Optional[list[str]] = None,
+        cursor: Optional[duckdb.DuckDBPyConnection] = None,
+    ):
         """
         Retrieves a standardized report from the database for specified samples.
 
@@ -485,21 +637,63 @@ class Feature:
             samples (list): A list of sample accessions to filter the report.
             columns (list, optional): A list of column names to include in the report.
                                       If None, all columns are included.
+            min_aa (int, optional): If given, only unique peptides with a positive intensity,
+                                    a condition other than 'Empty' and at least min_aa
+                                    amino acids are read. If None, all features are included.
+            rows_per_batch (int, optional): The number of rows fetched per Arrow record batch.
+                                            Defaults to 1,000,000.
+            categorical (list, optional): Columns returned as pandas categoricals with sorted
+                                          categories. They are dictionary-encoded in Arrow, so
+                                          only the distinct strings become Python objects.
+            cursor (duckdb.DuckDBPyConnection, optional): The cursor used to run the query.
+                                                          Defaults to the database connection.
 
         Returns:
             pd.DataFrame: A DataFrame containing the report with standardized column names.
         """
-        cols = ",".join(columns) if columns is not None else "*"
-        database = self.parquet_db.sql(
-            """SELECT {} FROM parquet_db WHERE sample_accession IN {}""".format(
-                cols, tuple(samples)
+        cols = ",".join(f'"{column}"' for column in columns) if columns is not None else "*"
+        query = f"SELECT {cols} FROM parquet_db WHERE sample_accession = ANY(?)"
+        params = [list(samples)]
+        if params[0]:
+            # The list membership runs as a join after the scan; the range of the requested
+            # samples is pushed into the Parquet scan, so row groups outside it are skipped
+            # using their min/max statistics.
+            query += " AND sample_accession BETWEEN ? AND ?"
+            params.extend([min(params[0]), max(params[0])])
+        if min_aa is not None:
+            # Drop the features discarded by the normalization while scanning the parquet file
+            query += (
+                ' AND "unique" = 1 AND intensity > 0'
+                " AND (condition IS NULL OR condition <> 'Empty')"
+                " AND length(sequence) >= ?"
+            )
+            params.append(min_aa)
+        # Stream the result and encode each record batch as it arrives, so the raw strings of
+        # the categorical columns are released batch by batch. The encoded batches are
+        # converted to pandas in one step at the end.
+        cursor = cursor if cursor is not None else self.parquet_db
+        reader = fetch_arrow_reader(cursor.execute(query, params), rows_per_batch)
+        categorical = categorical or []
+        tables = [
+            Feature.encode_table(pa.Table.from_batches([batch]), categorical) for batch in reader
+        ]
+        if not tables:
+            tables = [Feature.encode_table(reader.schema.empty_table(), categorical)]
+        report = pa.concat_tables(tables).to_pandas()
+        del tables
+        # Every batch has its own dictionary, so sort the unified categories
+        for column in categorical:
+            report[column] = report[column].cat.reorder_categories(
+                sorted(report[column].cat.categories)
             )
-        )
-        report = database.df()
         return Feature.standardize_df(report)
 
     def iter_samples(
-        self, sample_num: int = 20, columns: list = None
+        self,
+        sample_num: int = 20,
+        columns: list = None,
+        min_aa: Optional[int] = None,
+        categorical: Optional[list[str]] = None,
     ) -> Iterator[tuple[list[str], pd.DataFrame]]:
         """
         Iterates over samples in batches, yielding each batch along with its corresponding
@@ -508,6 +702,8 @@ class Feature:
         Parameters:
             sample_num (int, optional): The number of samples to include in each batch. Defaults to 20.
             columns (list, optional): A list of column names to include in the report. If None, all columns are included.
+            min_aa (int, optional): If given, only features passing the initial filters are read.
+            categorical (list, optional): Columns returned as pandas categoricals.
 
         Yields:
             Iterator[tuple[list[str], pd.DataFrame]]: An iterator over tuples, each containing a list of sample accessions
@@ -516,9 +712,27 @@ class Feature:
         ref_list = [
             self.samples[i : i + sample_num] for i in range(0, len(self.samples), sample_num)
         ]
-        for refs in ref_list:
-            batch_df = self.get_report_from_database(refs, columns)
-            yield refs, batch_df
+        if not ref_list:
+            return
+        # Fetch the next batch on its own cursor in a background thread while the caller
+        # processes the current one; DuckDB releases the GIL while it scans the file.
+        cursor = self.parquet_db.cursor()
+
+        def fetch(refs: list[str]) -> pd.DataFrame:
+            return self.get_report_from_database(
+                refs, columns, min_aa, categorical=categorical, cursor=cursor
+            )
+
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                future = executor.submit(fetch, ref_list[0])
+                for i, refs in enumerate(ref_list):
+                    batch_df = future.result()
+                    if i + 1 < len(ref_list):
+                        future = executor.submit(fetch, ref_list[i + 1])
+                    yield refs, batch_df
+        finally:
+            cursor.close()
 
     def get_unique_samples(self) -> list[str]:
         """
@@ -527,8 +741,7 @@ class Feature:
         Returns:
             list[str]: A list of unique sample accession identifiers.
         """
-        unique = self.parquet_db.sql("SELECT DISTINCT sample_accession FROM parquet_db").df()
-        return unique["sample_accession"].tolist()
+        return list(self._unique_samples)
 
     def get_unique_labels(self) -> list[str]:
         """
@@ -537,8 +750,7 @@ class Feature:
         Returns:
             list[str]: A list of unique channel labels.
         """
-        unique = self.parquet_db.sql("SELECT DISTINCT channel FROM parquet_db").df()
-        return unique["channel"].tolist()
+        return list(self._unique_labels)
 
     def get_unique_tec_reps(self) -> list[int]:
         """
@@ -550,19 +762,15 @@ class Feature:
         Raises:
             ValueError: If there is an error converting the 'run' identifiers to integers.
         """
-        unique = self.parquet_db.sql("SELECT DISTINCT run FROM parquet_db").df()
         try:
-            if unique["run"].str.contains("_").all():
-                unique["run"] = unique["run"].str.split("_").str.get(1)
-                unique["run"] = unique["run"].astype("int")
-            else:
-                unique["run"] = unique["run"].astype("int")
+            tec_reps = get_technical_replicates(self._unique_runs)
         except ValueError as e:
             raise ValueError(
                 f"Some errors occurred when getting technical repetitions: {e}"
             ) from e
 
-        return unique["run"].tolist()
+        # Several runs (e.g. fractions) share a technical replicate, so deduplicate again
+        return sorted(set(tec_reps.values()))
 
     def get_median_map(self) -> dict[str, float]:
         """
@@ -573,14 +781,13 @@ class Feature:
             dict[str, float]: A dictionary mapping each sample accession to its normalized
                               median intensity value.
         """
-        med_map: dict[str, float] = {}
-        for _, batch_df in self.iter_samples(1000, ["sample_accession", "intensity"]):
-            meds = batch_df.groupby(["sample_accession"])["intensity"].median()
-            med_map.update(meds.to_dict())
-        global_med = np.median([med for med in med_map.values()])
-        for sample, med in med_map.items():
-            med_map[sample] = med / global_med
-        return med_map
+        meds = pd.concat(
+            [
+                batch_df.groupby("sample_accession")["intensity"].median()
+                for _, batch_df in self.iter_samples(1000, ["sample_accession", "intensity"])
+            ]
+        )
+        return (meds / meds.median()).to_dict()
 
     def get_report_condition_from_database(self, cons: list, columns: list = None) -> pd.DataFrame:
         """
@@ -594,11 +801,12 @@ class Feature:
         Returns:
             pd.DataFrame: A DataFrame containing the report with standardized column names.
         """
-        cols = ",".join(columns) if columns is not None else "*"
-        database = self.parquet_db.sql(
-            f"""SELECT {cols} FROM parquet_db WHERE condition IN {tuple(cons)}"""
+        cols = ",".join(f'"{column}"' for column in columns) if columns is not None else "*"
+        database = self.parquet_db.execute(
+            f"""SELECT {cols} FROM parquet_db WHERE condition IN ({",".join("?" * len(cons))})""",
+            list(cons),
         )
-        report = database.df()
+        report = Feature.join_protein_groups(fetch_arrow_table(database)).to_pandas()
         return Feature.standardize_df(report)
 
     def iter_conditions(
@@ -631,8 +839,7 @@ class Feature:
         Returns:
             list[str]: A list of unique condition identifiers.
         """
-        unique = self.parquet_db.sql("SELECT DISTINCT condition FROM parquet_db").df()
-        return unique["condition"].tolist()
+        return list(self._unique_conditions)
 
     def get_median_map_to_condition(self) -> dict[str, dict[str, float]]:
         """
@@ -646,20 +853,139 @@ class Feature:
                                          to its normalized median intensity value.
         """
         med_map = {}
-        for cons, batch_df in self.iter_conditions(
+        for _, batch_df in self.iter_conditions(
             1000, ["condition", "sample_accession", "intensity"]
         ):
-            for con in cons:
-                meds = (
-                    batch_df[batch_df["condition"] == con]
-                    .groupby(["sample_accession"])["intensity"]
-                    .median()
-                )
-                meds = meds / meds.mean()
-                med_map[con] = meds.to_dict()
+            meds = batch_df.groupby(["condition", "sample_accession"])["intensity"].median()
+            meds = meds / meds.groupby(level="condition").transform("mean")
+            for con, con_meds in meds.groupby(level="condition"):
+                med_map[con] = con_meds.droplevel("condition").to_dict()
         return med_map
 
 
+def normalize_sample(
+    dataset_df: pd.DataFrame,
+    sample: str,
+    label: QuantificationCategory,
+    choice: Optional[IsobaricLabel],
+    min_aa: int,
+    min_unique: int,
+    remove_ids: Optional[str],
+    remove_decoy_contaminants: bool,
+    technical_repetitions: int,
+    feature_normalization: Optional[FeatureNormalizationMethod],
+    peptide_normalized: Optional[PeptideNormalizationMethod],
+    med_map: dict,
+    low_frequency_peptides: Optional[pd.MultiIndex],
+    log2: bool,
+) -> pd.DataFrame:
+    """
+    Filter and normalize the features of a single sample into peptide intensities.
+
+    The function only depends on its arguments, so samples can be processed
+    independently of each other, e.g. in worker processes.
+
+    Parameters:
+        dataset_df (pd.DataFrame): The features of the sample as read from the parquet file.
+        sample (str): The sample accession.
+        label (QuantificationCategory): The quantification category of the experiment.
+        choice (Optional[IsobaricLabel]): The isobaric label scheme, if applicable.
+        min_aa (int): Minimum number of amino acids required for peptides.
+        min_unique (int): Minimum number of unique peptides per protein.
+        remove_ids (Optional[str]): Path to a file with protein IDs to remove.
+        remove_decoy_contaminants (bool): Whether to remove decoys and contaminants.
+        technical_repetitions (int): The number of technical repetitions.
+        feature_normalization (Optional[FeatureNormalizationMethod]): The method used to
+            normalize features between runs, or None to skip it.
+        peptide_normalized (Optional[PeptideNormalizationMethod]): The method used to
+            normalize peptides between samples, or None to skip it.
+        med_map (dict): The median map used by the peptide normalization.
+        low_frequency_peptides (Optional[pd.MultiIndex]): (protein, peptide) pairs to remove,
+                                                          or None.
+        log2 (bool): Whether to apply log2 transformation to intensities.
+
+    Returns:
+        pd.DataFrame: The normalized peptide intensities of the sample.
+    """
+    # Perform data preprocessing on every sample
+    logger.info(f"{str(sample).upper()}: Data preprocessing...")
+
+    # Step1: Parse the identifier of proteins and retain only unique peptides.
+    dataset_df = dataset_df[dataset_df["unique"] == 1]
+    dataset_df = dataset_df[PARQUET_COLUMNS]
+
+    dataset_df = reformat_quantms_feature_table_quant_labels(dataset_df, label, choice)
+
+    # Step2: Remove lines where intensity or study condition is empty.
+    # Step3: Filter peptides with less amino acids than min_aa.
+    dataset_df = apply_initial_filtering(dataset_df, min_aa)
+
+    # Step4: Delete low-confidence proteins.
+    unique_peptides = dataset_df.groupby(PROTEIN_NAME, observed=True, sort=False)[
+        PEPTIDE_CANONICAL
+    ].transform("nunique")
+    dataset_df = dataset_df[unique_peptides >= min_unique]
+
+    # Step5: Filter decoy, contaminants, entrapment
+    if remove_decoy_contaminants:
+        dataset_df = remove_contaminants_entrapments_decoys(dataset_df)
+
+    # Step6: Filter user-specified proteins
+    if remove_ids is not None:
+        dataset_df = remove_protein_by_ids(dataset_df, remove_ids)
+    dataset_df.rename(columns={INTENSITY: NORM_INTENSITY}, inplace=True)
+
+    # Step7: Normalize at feature level between ms runs (technical repetitions)
+    if feature_normalization is not None:
+        logger.info(f"{str(sample).upper()}: Normalize intensities of features.. ")
+        dataset_df = feature_normalization(dataset_df, technical_repetitions)
+        # dataset_df = normalize_runs(dataset_df, technical_repetitions, nmethod)
+        logger.info(
+            f"{str(sample).upper()}: Number of features after normalization: {len(dataset_df.index)}"
+        )
+    # Step8: Merge peptidoforms across fractions and technical repetitions
+    dataset_df = get_peptidoform_normalize_intensities(dataset_df)
+    logger.info(
+        f"{str(sample).upper()}: Number of peptides after peptidofrom selection: {len(dataset_df.index)}"
+    )
+
+    if len(dataset_df[FRACTION].unique().tolist()) > 1:
+        logger.info(f"{str(sample).upper()}: Merge features across fractions.. ")
+        dataset_df = merge_fractions(dataset_df)
+        logger.info(
+            f"{str(sample).upper()}: Number of features after merging fractions: {len(dataset_df.index)}"
+        )
+    # Step9: Normalize the data.
+    if peptide_normalized is not None:
+        dataset_df = peptide_normalized(dataset_df, sample, med_map)
+
+    # Step10: Remove peptides with low frequency.
+    if low_frequency_peptides is not None:
+        dataset_df.set_index([PROTEIN_NAME, PEPTIDE_CANONICAL], drop=True, inplace=True)
+        dataset_df = dataset_df[~dataset_df.index.isin(low_frequency_peptides)].reset_index()
+        logger.info(
+            f"{str(sample).upper()}: Peptides after remove low frequency peptides: {len(dataset_df.index)}"
+        )
+
+    # Step11: Assembly peptidoforms to peptides.
+    logger.info(f"{str(sample).upper()}: Sum all peptidoforms per sample...")
+    dataset_df = sum_peptidoform_intensities(dataset_df)
+    logger.info(
+        f"{str(sample).upper()}: Number of peptides after selection: {len(dataset_df.index)}"
+    )
+    # Step12: Intensity transformation to log.
+    if log2:
+        dataset_df[NORM_INTENSITY] = np.log2(dataset_df[NORM_INTENSITY])
+
+    # Protein and peptide categories differ between samples, so write them as plain strings
+    # to keep a single schema across the incremental outputs.
+    for column in [PROTEIN_NAME, PEPTIDE_CANONICAL]:
+        dataset_df[column] = dataset_df[column].astype(object)
+
+    logger.info(f"{str(sample).upper()}: Save the normalized peptide intensities...")
+    return dataset_df
+
+
 def peptide_normalization(
     parquet: str,
     sdrf: str,
@@ -674,6 +1000,7 @@ def peptide_normalization(
     pnmethod: str,
     log2: bool,
     save_parquet: bool,
+    n_jobs: int = 1,
 ) -> None:
     """
     Perform peptide normalization on a proteomics dataset.
@@ -712,6 +1039,9 @@ def peptide_normalization(
         Whether to apply log2 transformation to intensities.
     save_parquet : bool
         Whether to save results in Parquet format.
+    n_jobs : int
+        Number of worker processes used to normalize samples in parallel (-1 uses all cores).
+        Per-sample log messages emitted inside worker processes are not forwarded.
     """
 
     if os.path.exists(output):
@@ -731,8 +1061,14 @@ def peptide_normalization(
     else:
         technical_repetitions, label, sample_names, choice = feature.experimental_inference
 
-    if remove_low_frequency_peptides:
-        low_frequency_peptides = feature.low_frequency_peptides
+    low_frequency_peptides = None
+    if remove_low_frequency_peptides and len(sample_names) > 1:
+        # Shipped to every per-sample task, so keep it as a compact MultiIndex that pickles
+        # as level codes and is matched against the (protein, peptide) index directly.
+        pairs = feature.low_frequency_peptides
+        low_frequency_peptides = pd.MultiIndex.from_arrays(
+            [[protein for protein, _ in pairs], [peptide for _, peptide in pairs]]
+        )
 
     med_map = {}
     if not skip_normalization and peptide_normalized == PeptideNormalizationMethod.GlobalMedian:
@@ -753,91 +1089,52 @@ def peptide_normalization(
         writer_parquet_task = WriteParquetTask(output)
         writer_parquet_task.start()
 
-    for samples, df in feature.iter_samples():
-        df.dropna(subset=["pg_accessions"], inplace=True)
-        for sample in samples:
-            # Perform data preprocessing on every sample
-            logger.info(f"{str(sample).upper()}: Data preprocessing...")
-            dataset_df = df[df["sample_accession"] == sample].copy()
-
-            # Step1: Parse the identifier of proteins and retain only unique peptides.
-            dataset_df = dataset_df[dataset_df["unique"] == 1]
-            dataset_df = dataset_df[PARQUET_COLUMNS]
-
-            dataset_df = reformat_quantms_feature_table_quant_labels(dataset_df, label, choice)
-
-            # Step2: Remove lines where intensity or study condition is empty.
-            # Step3: Filter peptides with less amino acids than min_aa.
-            dataset_df = apply_initial_filtering(dataset_df, min_aa)
-
-            # Step4: Delete low-confidence proteins.
-            dataset_df = dataset_df.groupby(PROTEIN_NAME).filter(
-                lambda x: len(set(x[PEPTIDE_CANONICAL])) >= min_unique
-            )
-
-            # Step5: Filter decoy, contaminants, entrapment
-            if remove_decoy_contaminants:
-                dataset_df = remove_contaminants_entrapments_decoys(dataset_df)
-
-            # Step6: Filter user-specified proteins
-            if remove_ids is not None:
-                dataset_df = remove_protein_by_ids(dataset_df, remove_ids)
-            dataset_df.rename(columns={INTENSITY: NORM_INTENSITY}, inplace=True)
-
-            # Step7: Normalize at feature level between ms runs (technical repetitions)
-            if (
-                not skip_normalization
-                and nmethod not in ("none", None)
-                and technical_repetitions > 1
-            ):
-                logger.info(f"{str(sample).upper()}: Normalize intensities of features.. ")
-                dataset_df = feature_normalization(dataset_df, technical_repetitions)
-                # dataset_df = normalize_runs(dataset_df, technical_repetitions, nmethod)
-                logger.info(
-                    f"{str(sample).upper()}: Number of features after normalization: {len(dataset_df.index)}"
-                )
-            # Step8: Merge peptidoforms across fractions and technical repetitions
-            dataset_df = get_peptidoform_normalize_intensities(dataset_df)
-            logger.info(
-                f"{str(sample).upper()}: Number of peptides after peptidofrom selection: {len(dataset_df.index)}"
-            )
-
-            if len(dataset_df[FRACTION].unique().tolist()) > 1:
-                logger.info(f"{str(sample).upper()}: Merge features across fractions.. ")
-                dataset_df = merge_fractions(dataset_df)
-                logger.info(
-                    f"{str(sample).upper()}: Number of features after merging fractions: {len(dataset_df.index)}"
-                )
-            # Step9: Normalize the data.
-            if not skip_normalization:
-                dataset_df = peptide_normalized(dataset_df, sample, med_map)
-
-            # Step10: Remove peptides with low frequency.
-            if remove_low_frequency_peptides and len(sample_names) > 1:
-                dataset_df.set_index([PROTEIN_NAME, PEPTIDE_CANONICAL], drop=True, inplace=True)
-                dataset_df = dataset_df[
-                    ~dataset_df.index.isin(low_frequency_peptides)
-                ].reset_index()
-                logger.info(
-                    f"{str(sample).upper()}: Peptides after remove low frequency peptides: {len(dataset_df.index)}"
+    if skip_normalization or nmethod in ("none", None) or technical_repetitions <= 1:
+        feature_normalization = None
+    if skip_normalization:
+        peptide_normalized = None
+
+    # Samples are independent of each other, so they can be normalized in worker processes.
+    # Results are returned in submission order, which keeps the output stable for any n_jobs.
+    with Parallel(n_jobs=n_jobs) as parallel:
+        # Only project the columns the pipeline uses so DuckDB skips the remaining column chunks
+        for _, df in feature.iter_samples(
+            columns=PARQUET_COLUMNS + ["unique"],
+            min_aa=min_aa,
+            categorical=["peptidoform", "sequence", "condition", "sample_accession"],
+        ):
+            df.dropna(subset=["pg_accessions"], inplace=True)
+            # Partition the batch by sample in a single pass; groupby sorts the samples, so the
+            # output order does not depend on DuckDB's scan order.
+            results = parallel(
+                delayed(normalize_sample)(
+                    dataset_df,
+                    sample,
+                    label,
+                    choice,
+                    min_aa,
+                    min_unique,
+                    remove_ids,
+                    remove_decoy_contaminants,
+                    technical_repetitions,
+                    feature_normalization,
+                    peptide_normalized,
+                    med_map,
+                    low_frequency_peptides,
+                    log2,
                 )
-
-            # Step11: Assembly peptidoforms to peptides.
-            logger.info(f"{str(sample).upper()}: Sum all peptidoforms per sample...")
-            dataset_df = sum_peptidoform_intensities(dataset_df)
-            logger.info(
-                f"{str(sample).upper()}: Number of peptides after selection: {len(dataset_df.index)}"
+                for sample, dataset_df in df.groupby("sample_accession", observed=True)
             )
-            # Step12: Intensity transformation to log.
-            if log2:
-                dataset_df[NORM_INTENSITY] = np.log2(dataset_df[NORM_INTENSITY])
-
-            logger.info(f"{str(sample).upper()}: Save the normalized peptide intensities...")
-
+            if not results:
+                continue
+            # Hand the whole batch to the writers in one call
+            batch_df = pd.concat(results, ignore_index=True)
+            for column in [SAMPLE_ID, CONDITION]:
+                batch_df[column] = batch_df[column].astype("category")
             if save_parquet:
-                writer_parquet_task.write(dataset_df)
+                writer_parquet_task.write(batch_df)
             if write_csv:
-                write_csv_task.write(dataset_df)
+                write_csv_task.write(batch_df)
 
     if write_csv:
         write_csv_task.close()
@@ -1,7 +1,7 @@
 import logging
-import math
 
-from typing import List, Union, Optional
+from itertools import chain
+from typing import Callable, Iterable, Union, Optional
 
 import pandas as pd
 import numpy as np
@@ -43,17 +43,6 @@ AVERAGE_BASE_PAIR_MASS: float = 617.96  # 615.8771
 logger = logging.getLogger("ibaqpy.peptides2protein")
 logger.addHandler(logging.NullHandler())
 
-def normalize(group):
-    """
-    Normalize the ibaq values using the total ibaq of the sample.
-    This method is called rIBAQ, originally published in https://pubs.acs.org/doi/10.1021/pr401017h
-    :param group: Dataframe with all the ibaq values
-    :return: Dataframe with the normalized ibaq values
-    """
-    group[IBAQ_NORMALIZED] = group[IBAQ] / group[IBAQ].sum()
-    return group
-
-
 def normalize_ibaq(res: DataFrame) -> DataFrame:
     """
     Normalize the ibaq values using the total ibaq of the sample. The resulted
@@ -62,11 +51,15 @@ def normalize_ibaq(res: DataFrame) -> DataFrame:
     :param res: Dataframe
     :return:
     """
-    res = res.groupby([SAMPLE_ID, CONDITION]).apply(normalize)
+    # rIBAQ (https://pubs.acs.org/doi/10.1021/pr401017h): ibaq over the total ibaq of the sample
+    res = res.sort_values([SAMPLE_ID, CONDITION], kind="stable")
+    total_ibaq = res.groupby([SAMPLE_ID, CONDITION], observed=True)[IBAQ].transform("sum")
+    res[IBAQ_NORMALIZED] = res[IBAQ] / total_ibaq
     # Normalization method used by Proteomics DB 10 + log10(ibaq/sum(ibaq))
-    res[IBAQ_LOG] = res[IBAQ_NORMALIZED].apply(lambda x: (math.log10(x) + 10) if x > 0 else 0)
+    positive = res[IBAQ_NORMALIZED] > 0
+    res[IBAQ_LOG] = (np.log10(res[IBAQ_NORMALIZED].where(positive)) + 10).where(positive, 0)
     # Normalization used by PRIDE Team (no log transformation) (ibaq/total_ibaq) * 100'000'000
-    res[IBAQ_PPB] = res[IBAQ_NORMALIZED].apply(lambda x: x * 100_000_000)
+    res[IBAQ_PPB] = res[IBAQ_NORMALIZED] * 100_000_000
     return res
 
 
@@ -82,7 +75,9 @@ def handle_nonstandard_aa(aa_seq: str):
     return nonstandard_aa_lst, considered_seq
 
 
-def extract_fasta(fasta: str, enzyme: str, proteins: List, min_aa: int, max_aa: int, tpa: bool):
+def extract_fasta(
+    fasta: str, enzyme: str, proteins: Iterable[str], min_aa: int, max_aa: int, tpa: bool
+):
     """
     Extracts protein information from a FASTA file using a specified enzyme for digestion.
 
@@ -93,7 +88,7 @@ def extract_fasta(fasta: str, enzyme: str, proteins: List, min_aa: int, max_aa:
 
     :param fasta: Path to the FASTA file containing protein sequences.
     :param enzyme: Name of the enzyme used for protein digestion.
-    :param proteins: List of protein accessions to search for in the FASTA file.
+    :param proteins: Collection of protein accessions to search for in the FASTA file.
     :param min_aa: Minimum number of amino acids for peptides to be considered.
     :param max_aa: Maximum number of amino acids for peptides to be considered.
     :param tpa: Boolean indicating whether to calculate theoretical protein abundance.
@@ -102,6 +97,7 @@ def extract_fasta(fasta: str, enzyme: str, proteins: List, min_aa: int, max_aa:
     :raises ValueError: If none of the specified proteins are found in the FASTA file.
     """
 
+    proteins = set(proteins)
     fasta_proteins = list()
     FASTAFile().load(fasta, fasta_proteins)
     found_proteins = set()
@@ -156,14 +152,19 @@ class ConcentrationWeightByProteomicRuler:
 
         self.dna_mass = self.ploidy * self.organism.genome_size * AVERAGE_BASE_PAIR_MASS / AVAGADRO
 
-    def total_histone_intensities(self, protein_intensities: pd.DataFrame) -> float:
+    def apply_ruler(self, protein_intensities: pd.DataFrame) -> pd.DataFrame:
+        return self._apply_ruler(protein_intensities, lambda values: values.sum())
+
+    def _apply_ruler(
+        self,
+        protein_intensities: pd.DataFrame,
+        total: Callable[[pd.Series], Union[float, pd.Series]],
+    ) -> pd.DataFrame:
         histones = set(self.organism.histone_entries)
         is_histone_mask = protein_intensities[PROTEIN_NAME].isin(histones)
-        histone_intensities = max(protein_intensities[is_histone_mask][NORM_INTENSITY].sum(), 1.0)
-        return histone_intensities
-
-    def apply_ruler(self, protein_intensities: pd.DataFrame) -> pd.DataFrame:
-        histone_intensity = self.total_histone_intensities(protein_intensities)
+        histone_intensity = np.maximum(
+            total(protein_intensities[NORM_INTENSITY].where(is_histone_mask, 0.0)), 1.0
+        )
 
         protein_intensities[COPYNUMBER] = (
             protein_intensities[NORM_INTENSITY]
@@ -178,7 +179,7 @@ class ConcentrationWeightByProteomicRuler:
             protein_intensities[MOLES_NMOL] * protein_intensities[MOLECULARWEIGHT]
         )
 
-        volume = protein_intensities[WEIGHT_NG].sum() / 1e-9 / self.concentration_per_cell
+        volume = total(protein_intensities[WEIGHT_NG]) / 1e-9 / self.concentration_per_cell
         protein_intensities[CONCENTRATION_NM] = volume * protein_intensities[MOLES_NMOL]
         return protein_intensities
 
@@ -186,8 +187,13 @@ class ConcentrationWeightByProteomicRuler:
         return self.apply_ruler(protein_intensities)
 
     def apply_by_condition(self, protein_intensities: pd.DataFrame):
-        protein_intensities = protein_intensities.groupby([CONDITION]).apply(self)
-        return protein_intensities
+        # Rows are grouped by condition; histone and weight totals are summed per condition.
+        protein_intensities = protein_intensities.sort_values(CONDITION, kind="stable")
+        conditions = protein_intensities[CONDITION]
+        return self._apply_ruler(
+            protein_intensities,
+            lambda values: values.groupby(conditions, observed=True).transform("sum"),
+        )
 
 
 class PeptideProteinMapper:
@@ -226,26 +232,24 @@ class PeptideProteinMapper:
             val = self._peptide_protein_ratio[protein_group] = total / len(proteins_list)
         return val
 
-    def get_average_nr_peptides_unique_by_group(self, pdrow: Series) -> Union[float, Series]:
+    def get_average_nr_peptides_unique(self, intensities: Series) -> Series:
         """
         Calculate the average number of unique peptides per protein group.
 
-        This function computes the average number of unique peptides for a given
-        protein group by dividing the normalized intensity by the product of the
-        group size and the average unique peptide count. If no proteins are found
-        in the group or the sum of unique peptide counts is zero, it returns NaN.
+        The normalized intensity of each group is divided by the group size and the
+        average unique peptide count of its proteins; groups without unique peptides
+        get NaN. The ratio is resolved once per distinct protein group.
 
-        :param pdrow: Series containing the protein group data.
+        :param intensities: Summed normalized intensities indexed by (protein, sample, condition).
         :return: Series containing the average number of unique peptides per protein group.
         """
-
-        average_peptides_per_protein = self.peptide_protein_ratio(pdrow.name[0])
-
-        if average_peptides_per_protein > 0:
-            return pdrow.NormIntensity / self.map_size[pdrow.name] / average_peptides_per_protein
-
-        # If there is no protein in the group, return np nan
-        return np.nan  # type: ignore
+        proteins = intensities.index.get_level_values(0)
+        ratios = proteins.map(
+            {prot: self.peptide_protein_ratio(prot) for prot in proteins.unique()}
+        )
+        ratios = np.where(ratios > 0, ratios, np.nan)
+        sizes = intensities.index.map(self.map_size)
+        return intensities / sizes / ratios
 
     def protein_group_mass(self, protein_group: str):
         """
@@ -312,20 +316,18 @@ def peptides_to_protein(
                 "Arguments `ploidy`, `cpc`, `organism` and `tpa` are required for calculate protein weight(ng) and concentration(nM)"
             )
 
-    # load data
+    # load data, reading only the columns needed to aggregate proteins
+    columns = [PROTEIN_NAME, SAMPLE_ID, CONDITION, NORM_INTENSITY]
     if is_parquet(peptides):
-        data = pd.read_parquet(peptides)
+        data = pd.read_parquet(peptides, columns=columns)
     else:
-        data = pd.read_csv(peptides)
+        data = pd.read_csv(peptides, usecols=columns, engine="pyarrow")
     data[NORM_INTENSITY] = data[NORM_INTENSITY].astype(float)
     data = data.dropna(subset=[NORM_INTENSITY])
     data = data[data[NORM_INTENSITY] > 0]
 
-    # get fasta info
-    proteins = data[PROTEIN_NAME].unique().tolist()
-
-    # TODO: This should check for duplicates?
-    proteins = sum([i.split(";") for i in proteins], [])
+    # get fasta info, collecting each protein of the groups only once
+    proteins = set(chain.from_iterable(group.split(";") for group in data[PROTEIN_NAME].unique()))
 
     unique_peptide_counts, mw_dict, found_proteins = extract_fasta(
         fasta, enzyme, proteins, min_aa, max_aa, tpa
@@ -335,8 +337,9 @@ def peptides_to_protein(
 
     # data processing
     logger.info(data.head())
-    map_size = data.groupby([PROTEIN_NAME, SAMPLE_ID, CONDITION]).size().to_dict()
-    res = pd.DataFrame(data.groupby([PROTEIN_NAME, SAMPLE_ID, CONDITION])[NORM_INTENSITY].sum())
+    grouped = data.groupby([PROTEIN_NAME, SAMPLE_ID, CONDITION], observed=True)[NORM_INTENSITY]
+    map_size = grouped.size().to_dict()
+    res = pd.DataFrame(grouped.sum())
 
     protein_mapper = PeptideProteinMapper(
         unique_peptide_counts=unique_peptide_counts,
@@ -345,7 +348,7 @@ def peptides_to_protein(
     )
 
     # ibaq
-    res[IBAQ] = res.apply(protein_mapper.get_average_nr_peptides_unique_by_group, 1)
+    res[IBAQ] = protein_mapper.get_average_nr_peptides_unique(res[NORM_INTENSITY])
     res = res.reset_index()
 
     # normalize ibaq
@@ -363,9 +366,12 @@ def peptides_to_protein(
 
     # tpa
     if tpa:
+        group_masses = {
+            group: protein_mapper.protein_group_mass(group) for group in res[PROTEIN_NAME].unique()
+        }
         res[MOLECULARWEIGHT] = (
             res[PROTEIN_NAME]
-            .apply(protein_mapper.protein_group_mass)
+            .map(group_masses)
             .fillna(1.0)
             .replace(0.0, 1.0)
         )
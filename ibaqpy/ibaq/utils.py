@@ -1,6 +1,7 @@
 # import libraries
 import logging
 import os
+from collections import Counter
 from typing import List, Optional
 
 import matplotlib.pyplot as plt
@@ -247,7 +248,7 @@ def get_batch_info_from_sample_names(sample_list: List[str]) -> List[int]:
     """
     samples = [s.split("-")[0] for s in sample_list]
     batches = list(set(samples))
-    index = {i: batches.index(i) for i in batches}
+    index = {b: i for i, b in enumerate(batches)}
 
     return [index[i] for i in samples]
 
@@ -276,9 +277,8 @@ def remove_single_sample_batches(df: pd.DataFrame, batch: list) -> pd.DataFrame:
     batch_dict = dict(zip(df.columns, batch))
 
     # from the batch_dict, get the batches with only one sample
-    single_sample_batch = [
-        k for k, v in batch_dict.items() if list(batch_dict.values()).count(v) == 1
-    ]
+    batch_sizes = Counter(batch_dict.values())
+    single_sample_batch = [k for k, v in batch_dict.items() if batch_sizes[v] == 1]
 
     # remove batches with only one sample
     df_single_batches_removed = df.drop(single_sample_batch, axis=1)
@@ -396,8 +396,8 @@ def apply_batch_correction(
         )
 
     # check if every batch factor has at least 2 samples
-    if any([batch.count(i) < 2 for i in set(batch)]):
-        short_batches = [i for i in set(batch) if batch.count(i) < 2]
+    short_batches = [i for i, count in Counter(batch).items() if count < 2]
+    if short_batches:
         raise TooFewSamplesInBatch(short_batches)
 
     # If not None, check if the number of covariates match the number of samples
@@ -2,7 +2,7 @@ import os
 
 from threading import Thread
 from queue import Queue, Empty
-from typing import Any
+from typing import Any, Optional, TextIO
 
 import pandas as pd
 import pyarrow as pa
@@ -25,6 +25,7 @@ class WriteCSVTask(Thread):
         write_options (dict[str, Any]): Options for writing the CSV file.
         _queue (Queue): A queue to manage DataFrames to be written.
         _wrote_header (bool): Indicates if the CSV header has been written.
+        _handle (Optional[TextIO]): The open CSV file, kept for the lifetime of the task.
 
     Methods:
         write(table: pd.DataFrame): Adds a DataFrame to the queue for writing.
@@ -38,6 +39,7 @@ class WriteCSVTask(Thread):
 
     _queue: Queue
     _wrote_header: bool
+    _handle: Optional[TextIO]
 
     def __init__(self, path: str, daemon: bool = True, write_options: dict = None, **kwargs):
         """
@@ -57,6 +59,7 @@ class WriteCSVTask(Thread):
             write_options (dict): Options for writing the CSV file.
             _wrote_header (bool): Indicates if the CSV header has been written.
             _queue (Queue): A queue to manage DataFrames to be written.
+            _handle (Optional[TextIO]): The open CSV file, created on the first write.
         """
         super().__init__(daemon=daemon)
         if write_options is None:
@@ -69,6 +72,7 @@ class WriteCSVTask(Thread):
         self.write_options = write_options | kwargs
         self._wrote_header = False
         self._queue = Queue()
+        self._handle = None
 
     def write(self, table: pd.DataFrame):
         """
@@ -87,24 +91,30 @@ class WriteCSVTask(Thread):
         """
         Writes a DataFrame to the CSV file specified by the path attribute.
 
-        This method appends the DataFrame to the CSV file if the header has
-        already been written; otherwise, it writes the DataFrame with the header.
-        The writing options are specified by the write_options attribute.
+        The file is opened once on the first write and kept open, so every
+        following DataFrame is appended to the same handle without the header.
+        The writing options are specified by the write_options attribute; its
+        encoding, UTF-8 unless given, is used to open the file.
 
         Parameters:
             table (pd.DataFrame): The DataFrame to be written to the CSV file.
         """
+        if self._handle is None:
+            # to_csv ignores the encoding when given a handle, so apply it when opening
+            encoding = self.write_options.pop("encoding", "utf-8")
+            self._handle = open(self.path, "w", newline="", encoding=encoding)
         table.to_csv(
-            self.path,
+            self._handle,
             header=not self._wrote_header,
-            mode="a+" if self._wrote_header else "w",
             index=False,
             **self.write_options,
         )
         self._wrote_header = True
 
     def _close(self):
-        pass
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
 
     def run(self):
         """
@@ -113,7 +123,7 @@ class WriteCSVTask(Thread):
         This method runs in a loop, retrieving DataFrames from the queue and
         writing them to the CSV file using the _write method. The loop exits
         when a None value is encountered in the queue, signaling the end of
-        the writing process.
+        the writing process, after which the CSV file is closed.
         """
         while True:
             try:
@@ -126,6 +136,8 @@ class WriteCSVTask(Thread):
 
             self._write(table)
 
+        self._close()
+
 
 class WriteParquetTask(Thread):
     """
@@ -4,6 +4,10 @@ from collections.abc import Mapping
 from dataclasses import dataclass, field
 from typing import ClassVar, Iterator, Union, Optional
 
+# Channels that only exist in the larger TMT plexes
+_TMT16_MARKERS = frozenset({"TMT134N", "TMT133C", "TMT133N", "TMT132C", "TMT132N"})
+_TMT11_MARKERS = frozenset({"TMT131C"})
+
 
 class QuantificationCategory(Enum):
     """
@@ -65,29 +69,23 @@ class QuantificationCategory(Enum):
             ValueError: If the labels do not correspond to a known quantification category.
         """
         label_scheme = None
+        upper_labels = {s.upper() for s in labels}
 
-        if len(labels) == 1 and any("label free" in s.lower() for s in labels):
+        if len(labels) == 1 and any("LABEL FREE" in s for s in upper_labels):
             label_category = cls.LFQ
 
-        elif any("tmt" in s.lower() for s in labels):
+        elif any("TMT" in s for s in upper_labels):
             label_category = cls.TMT
-            if (
-                len(labels) > 11
-                or "TMT134N" in labels
-                or "TMT133C" in labels
-                or "TMT133N" in labels
-                or "TMT132C" in labels
-                or "TMT132N" in labels
-            ):
+            if len(labels) > 11 or not upper_labels.isdisjoint(_TMT16_MARKERS):
                 label_scheme = IsobaricLabel.TMT16plex
-            elif len(labels) == 11 or "TMT131C" in labels:
+            elif len(labels) == 11 or not upper_labels.isdisjoint(_TMT11_MARKERS):
                 label_scheme = IsobaricLabel.TMT11plex
             elif len(labels) > 6:
                 label_scheme = IsobaricLabel.TMT10plex
             else:
                 label_scheme = IsobaricLabel.TMT6plex
 
-        elif any("itraq" in s.lower() for s in labels):
+        elif any("ITRAQ" in s for s in upper_labels):
             label_category = cls.ITRAQ
             if len(labels) > 4:
                 label_scheme = IsobaricLabel.ITRAQ8plex
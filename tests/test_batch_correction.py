@@ -73,5 +73,36 @@ def test_correct_batches():
         run_batch_correction(**args)
 
 
+def test_correct_batches_keeps_proteins_dropped_by_pivot(tmp_path):
+    """
+    Test that proteins without any iBAQ value, which the wide matrix drops, keep their
+    identifiers in the output with a missing corrected value.
+    """
+    for path in (TESTS_DIR / "ibaq-raw-hela").glob("*ibaq.tsv"):
+        df = pd.read_csv(path, sep="\t", comment="#")
+        missing = df.drop_duplicates(SAMPLE_ID).assign(**{PROTEIN_NAME: "ZZZ_ALLNAN", IBAQ: None})
+        pd.concat([df, missing]).to_csv(tmp_path / path.name, sep="\t", index=False)
+
+    df_ibaq = run_batch_correction(
+        folder=tmp_path,
+        pattern="*ibaq.tsv",
+        comment="#",
+        sep="\t",
+        output=tmp_path / "ibaq_corrected_combined.tsv",
+        sample_id_column=SAMPLE_ID,
+        protein_id_column=PROTEIN_NAME,
+        ibaq_raw_column=IBAQ,
+        ibaq_corrected_column=IBAQ_BEC,
+        export_anndata=False,
+    )
+
+    assert df_ibaq[PROTEIN_NAME].notna().all()
+    assert df_ibaq[SAMPLE_ID].notna().all()
+    dropped = df_ibaq[df_ibaq[PROTEIN_NAME] == "ZZZ_ALLNAN"]
+    assert len(dropped) == 46
+    assert dropped[IBAQ_BEC].isna().all()
+    assert df_ibaq.loc[df_ibaq[PROTEIN_NAME] != "ZZZ_ALLNAN", IBAQ_BEC].notna().any()
+
+
 if __name__ == "__main__":
     test_correct_batches()
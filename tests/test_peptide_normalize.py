@@ -1,6 +1,29 @@
 import logging
 
-from ibaqpy.ibaq.peptide_normalization import peptide_normalization
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from ibaqpy.ibaq.peptide_normalization import (
+    Feature,
+    get_peptidoform_normalize_intensities,
+    get_technical_replicates,
+    parse_uniprot_accession,
+    parse_uniprot_accessions,
+    peptide_normalization,
+    remove_protein_by_ids,
+)
+from ibaqpy.ibaq.ibaqpy_commons import (
+    BIOREPLICATE,
+    CONDITION,
+    NORM_INTENSITY,
+    PARQUET_COLUMNS,
+    PEPTIDE_CHARGE,
+    PEPTIDE_SEQUENCE,
+    PROTEIN_NAME,
+    SAMPLE_ID,
+)
+from ibaqpy.model.quantification_type import IsobaricLabel, QuantificationCategory
 from pathlib import Path
 
 TESTS_DIR = Path(__file__).parent
@@ -53,3 +76,125 @@ def test_feature_assembly():
     if out.exists():
         out.unlink()
     peptide_normalization(**args)
+
+
+def test_parse_uniprot_accessions():
+    """
+    Test that the vectorized accession parser agrees with `parse_uniprot_accession`
+    for plain accessions, db|accession|name entries and mixed protein groups.
+    """
+    groups = pd.Series(
+        [
+            "P12345",
+            "sp|P12345|PROT_HUMAN",
+            "sp|P12345|PROT_HUMAN;tr|Q67890|PROT2_HUMAN",
+            "P12345;sp|Q67890|PROT2_HUMAN",
+            "CONTAMINANT_P01|x",
+            "a|b|c|d;sp|Q67890|PROT2_HUMAN",
+            "|P12345|",
+        ]
+    )
+    expected = [parse_uniprot_accession(group) for group in groups]
+    assert parse_uniprot_accessions(groups).tolist() == expected
+
+
+def test_classify_labels():
+    """
+    Test that label sets are classified into the expected category and label scheme.
+    """
+    tmt = QuantificationCategory.TMT
+    assert QuantificationCategory.classify({"label free sample"}) == (
+        QuantificationCategory.LFQ,
+        None,
+    )
+    assert QuantificationCategory.classify({"TMT126", "TMT131"}) == (tmt, IsobaricLabel.TMT6plex)
+    assert QuantificationCategory.classify({"TMT126", "tmt131c"}) == (tmt, IsobaricLabel.TMT11plex)
+    assert QuantificationCategory.classify({"TMT126", "TMT134N"}) == (tmt, IsobaricLabel.TMT16plex)
+    assert QuantificationCategory.classify({"iTRAQ114", "iTRAQ117"}) == (
+        QuantificationCategory.ITRAQ,
+        IsobaricLabel.ITRAQ4plex,
+    )
+
+
+def test_feature_reads_legacy_column_names(tmp_path):
+    """
+    Test that feature tables using the older `protein_accessions`/`charge` column names
+    can be projected and filtered like the current layout.
+    """
+    table = pq.read_table(TESTS_DIR / "example/feature.parquet")
+    legacy = {"pg_accessions": "protein_accessions", "precursor_charge": "charge"}
+    table = table.rename_columns([legacy.get(name, name) for name in table.column_names])
+    pq.write_table(table, tmp_path / "feature.parquet")
+
+    columns = PARQUET_COLUMNS + ["unique"]
+    current = Feature(str(TESTS_DIR / "example/feature.parquet"))
+    older = Feature(str(tmp_path / "feature.parquet"))
+    expected = current.get_report_from_database(current.samples[:2], columns, min_aa=7)
+    report = older.get_report_from_database(older.samples[:2], columns, min_aa=7)
+    pd.testing.assert_frame_equal(report, expected)
+
+
+def test_get_peptidoform_normalize_intensities():
+    """
+    Test that the most intense row is kept per peptidoform, with ties resolved to the first
+    row, and that rows with a missing key are dropped like in a groupby.
+    """
+    dataset = pd.DataFrame(
+        {
+            PEPTIDE_SEQUENCE: ["PEPTIDEK"] * 5,
+            PEPTIDE_CHARGE: [2] * 5,
+            SAMPLE_ID: ["S1"] * 5,
+            CONDITION: ["A", "A", "A", None, "A"],
+            BIOREPLICATE: [1.0, 1.0, 1.0, 1.0, float("nan")],
+            NORM_INTENSITY: [1.0, 3.0, 3.0, 9.0, 9.0],
+            "Marker": ["a", "b", "c", "d", "e"],
+        }
+    )
+    result = get_peptidoform_normalize_intensities(dataset)
+    assert result["Marker"].tolist() == ["b"]
+
+
+def test_get_technical_replicates():
+    """
+    Test that every run is parsed on its own, so plain and 'biorep_techrep_fraction'
+    identifiers can be mixed.
+    """
+    assert get_technical_replicates(["1", "1_2_1", "3_1_2", "12"]) == {
+        "1": 1,
+        "1_2_1": 2,
+        "3_1_2": 1,
+        "12": 12,
+    }
+    with pytest.raises(ValueError):
+        get_technical_replicates(["1", "run_a"])
+
+
+def test_feature_experimental_inference():
+    """
+    Test that runs sharing a technical replicate across fractions are counted once.
+    """
+    feature = Feature(str(TESTS_DIR / "example/feature.parquet"))
+    technical_repetitions, label, samples, choice = feature.experimental_inference
+    assert technical_repetitions == 3
+    assert feature.get_unique_tec_reps() == [1, 2, 3]
+    assert label == QuantificationCategory.TMT
+    assert choice == IsobaricLabel.TMT6plex
+    assert samples == [f"PXD017834-Sample-{i}" for i in range(1, 7)]
+
+
+def test_remove_protein_by_ids(tmp_path):
+    """
+    Test that removal IDs are matched as literal substrings of the protein groups and that
+    an empty ID file leaves the dataset unchanged.
+    """
+    dataset = pd.DataFrame(
+        {PROTEIN_NAME: ["P12345.1", "P12345X1", "Q11111;P99999", "O00000", "P99999-2"]}
+    )
+    ids_file = tmp_path / "ids.txt"
+    ids_file.write_text("P12345.1\nP99999\n\n")
+    result = remove_protein_by_ids(dataset, str(ids_file))
+    assert result[PROTEIN_NAME].tolist() == ["P12345X1", "O00000"]
+
+    empty_file = tmp_path / "empty.txt"
+    empty_file.write_text("\n")
+    assert remove_protein_by_ids(dataset, str(empty_file)).equals(dataset)
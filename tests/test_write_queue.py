@@ -0,0 +1,31 @@
+import pandas as pd
+
+from ibaqpy.ibaq.write_queue import WriteCSVTask
+
+
+def test_write_csv_task_non_ascii(tmp_path):
+    """
+    Test that `WriteCSVTask` appends every DataFrame below a single header and writes
+    non-ASCII values as UTF-8 by default, or with the encoding given in the write options.
+    """
+    df = pd.DataFrame({"Condition": ["Blood – Plasma", "Liver"], "Intensity": [1.5, 2.0]})
+
+    writer = WriteCSVTask(str(tmp_path / "peptides.csv"))
+    writer.start()
+    writer.write(df)
+    writer.write(df)
+    writer.close()
+
+    content = (tmp_path / "peptides.csv").read_bytes().decode("utf-8")
+    assert content.splitlines()[0] == "Condition,Intensity"
+    assert content.count("Blood – Plasma") == 2
+    pd.testing.assert_frame_equal(
+        pd.read_csv(tmp_path / "peptides.csv", encoding="utf-8"),
+        pd.concat([df, df], ignore_index=True),
+    )
+
+    writer = WriteCSVTask(str(tmp_path / "latin.csv"), write_options={"encoding": "latin-1"})
+    writer.start()
+    writer.write(pd.DataFrame({"Condition": ["Hépatocyte"]}))
+    writer.close()
+    assert (tmp_path / "latin.csv").read_bytes().decode("latin-1").splitlines()[1] == "Hépatocyte"